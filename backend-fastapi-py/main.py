@@ -1,12 +1,22 @@
+import asyncio
 import logging
-from fastapi import FastAPI, HTTPException, UploadFile, File
+import multiprocessing
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import FastAPI, HTTPException, UploadFile, File, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from pydantic import BaseModel, Field, HttpUrl
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, ORJSONResponse
 from typing import Optional, Dict, Any, List
-from services.web_crawler import crawl_webpage
-from services.html_parser import ExtractionRule, parse_html_content
-from services.file_service import save_uploaded_file, get_file_path, file_exists, list_files
+from services.web_crawler import crawl_webpage, get_browser, shutdown_browser, close_http_client, CrawlTimeouts
+from services.html_parser import parse_html_content, ExtractionRule
+from services.file_service import save_uploaded_file, get_file_path, get_file_metadata, file_exists, list_files, ensure_upload_dir
+from settings import settings
+from schemas import WebCrawlerRequest, WebCrawlerResponse, BatchCrawlRequest, HtmlParseRequest, HtmlParseResponse
 
 # Configure logging (call once at the start)
 logging.basicConfig(
@@ -18,7 +28,8 @@ logging.basicConfig(
 # Get a logger for this module if needed (optional here)
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+# 모든 JSON 응답을 orjson으로 직렬화 (대용량 HTML/텍스트 응답의 직렬화 비용 절감)
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # CORS 설정
 origins = [
@@ -35,70 +46,213 @@ app.add_middleware(
     allow_headers=["*"], # Allows all headers
 )
 
-class WebCrawlerRequest(BaseModel):
-    url: HttpUrl
-    waitForSelectorOnPage: Optional[str] = Field(None, alias='waitForSelectorOnPage')
-    iframeSelector: Optional[str] = Field(None, alias='iframeSelector')
-    waitForSelectorInIframe: Optional[str] = Field(None, alias='waitForSelectorInIframe')
-    timeout: int = 30000
-    headers: Optional[Dict[str, str]] = None
-    extract_element_selector: Optional[str] = Field(None, alias='extractElementSelector')
-    output_format: Optional[str] = 'html'
-
-class WebCrawlerResponse(BaseModel):
-    url: str
-    status: str
-    error: Optional[str] = None
-    title: Optional[str] = None
-    text: Optional[str] = None
-    html: Optional[str] = None
-    extracted_content: Optional[str] = None
-    extracted_data: Optional[Dict[str, Any]] = None
-
-# HTML Parser API endpoint
-class HtmlParseRequest(BaseModel):
-    html_content: str
-    extraction_rules: List[ExtractionRule]
-
-class HtmlParseResponse(BaseModel):
-    status: str
-    data: Dict[str, Any] = None
-    error: Optional[str] = None
+class APIGZipMiddleware(GZipMiddleware):
+    """업로드된 파일(이미 압축된 이미지)은 건너뛰고 그 외 응답에만 gzip을 적용합니다."""
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith("/api/files/"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+# 크롤러의 html/text 응답은 수백 KB에 달할 수 있으므로 1KB 이상 응답을 압축
+app.add_middleware(APIGZipMiddleware, minimum_size=1024, compresslevel=5)
+
+@app.on_event("startup")
+async def init_upload_dir():
+    """업로드 디렉토리는 요청마다 확인하지 않고 시작 시 한 번만 생성합니다."""
+    ensure_upload_dir()
+
+@app.on_event("startup")
+async def start_browser():
+    """워커마다 Chromium을 한 번만 띄워두고 요청 간에 재사용합니다."""
+    app.state.crawl_semaphore = asyncio.Semaphore(settings.CRAWLER_MAX_CONTEXTS)
+    try:
+        await get_browser()
+    except Exception as e:
+        # 브라우저를 띄우지 못해도 다른 API는 동작해야 하므로, 첫 크롤링 요청 시 다시 시도
+        logger.exception("Failed to launch shared browser, will retry on first crawl: %s", e)
+
+@app.on_event("shutdown")
+async def stop_browser():
+    await shutdown_browser()
+    await close_http_client()
+
+@app.on_event("startup")
+async def start_parse_pool():
+    """HTML 파싱은 CPU 작업이므로 GIL을 피해 별도 프로세스 풀에서 실행합니다 (0이면 스레드 풀 사용)."""
+    app.state.parse_pool = _new_parse_pool() if settings.HTML_PARSE_PROCESSES > 0 else None
+
+def _new_parse_pool() -> ProcessPoolExecutor:
+    # 이벤트 루프와 Playwright 스레드가 떠 있는 프로세스를 fork하지 않도록 spawn 사용
+    return ProcessPoolExecutor(
+        max_workers=settings.HTML_PARSE_PROCESSES,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+async def _parse_in_pool(html_content: str, extraction_rules: List[ExtractionRule]) -> Dict[str, Any]:
+    """
+    프로세스 풀에서 파싱합니다. 자식 프로세스가 비정상 종료(OOM, 파서 크래시)되면 풀이 영구히
+    BrokenProcessPool 상태가 되므로, 새 풀로 교체한 뒤 한 번 재시도합니다.
+    """
+    for attempt in range(2):
+        pool = app.state.parse_pool
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                pool, parse_html_content, html_content, extraction_rules
+            )
+        except BrokenProcessPool:
+            logger.warning("HTML parse process pool is broken, replacing it (attempt %d)", attempt + 1)
+            # 동시에 실패한 다른 요청이 이미 교체했다면 그 풀을 그대로 사용
+            if app.state.parse_pool is pool:
+                pool.shutdown(wait=False, cancel_futures=True)
+                app.state.parse_pool = _new_parse_pool()
+            if attempt:
+                raise
+
+@app.on_event("shutdown")
+async def stop_parse_pool():
+    if app.state.parse_pool:
+        app.state.parse_pool.shutdown(wait=False, cancel_futures=True)
 
 @app.get("/")
 async def root():
     return {"message": "Hello World"}
 
-@app.post("/api/web-crawler/fetch", response_model=WebCrawlerResponse)
-async def fetch_webpage_content(request: WebCrawlerRequest):
-    logger.info(f"Received crawl request for URL: {request.url}")
-    logger.info(f"Request details: iframe={request.iframeSelector}, waitPage={request.waitForSelectorOnPage}, waitIframe={request.waitForSelectorInIframe}, extractSelector={request.extract_element_selector}")
+# 오류 응답의 나머지 필드 기본값 (모든 필드를 직접 채우므로 model_construct로 검증을 생략)
+_ERROR_RESPONSE_DEFAULTS = {
+    "title": None,
+    "text": None,
+    "html": None,
+    "extracted_content": None,
+    "extracted_data": None,
+}
+
+def _crawl_error_response(url: str, e: BaseException) -> WebCrawlerResponse:
+    return WebCrawlerResponse.model_construct(
+        url=url,
+        status="error",
+        error=f"Internal Server Error: {str(e)}",
+        **_ERROR_RESPONSE_DEFAULTS
+    )
+
+# 설정에서 읽은 크롤링 timeout 분배 (모든 크롤링에 그대로 전달)
+_crawl_timeouts = CrawlTimeouts(
+    static_fetch_fraction=settings.CRAWL_STATIC_FETCH_FRAC,
+    nav_fraction=settings.CRAWL_NAV_FRAC,
+    page_wait_fraction=settings.CRAWL_PAGE_WAIT_FRAC,
+    iframe_wait_fraction=settings.CRAWL_IFRAME_WAIT_FRAC,
+    iframe_find_ms=settings.CRAWL_IFRAME_FIND_MS,
+    network_idle_fraction=settings.CRAWL_NETWORK_IDLE_FRAC,
+)
+
+async def _crawl(request: WebCrawlerRequest):
+    """공유 브라우저와 워커 단위 세마포어를 사용해 단일 URL을 크롤링합니다."""
+    logger.info("Received crawl request for URL: %s", request.url)
+    logger.info("Request details: iframe=%s, waitPage=%s, waitIframe=%s, extractSelector=%s", request.iframe_selector, request.wait_for_selector_on_page, request.wait_for_selector_in_iframe, request.extract_element_selector)
     try:
-        result = await crawl_webpage(
-            url=str(request.url),
-            iframe_selector=request.iframeSelector,
-            wait_for_selector_on_page=request.waitForSelectorOnPage,
-            wait_for_selector_in_iframe=request.waitForSelectorInIframe,
-            timeout=request.timeout,
-            headers=request.headers,
-            extract_element_selector=request.extract_element_selector
-        )
+        async with app.state.crawl_semaphore:
+            result = await crawl_webpage(
+                url=str(request.url),
+                iframe_selector=request.iframe_selector,
+                wait_for_selector_on_page=request.wait_for_selector_on_page,
+                wait_for_selector_in_iframe=request.wait_for_selector_in_iframe,
+                timeout=request.timeout,
+                headers=request.headers,
+                extract_element_selector=request.extract_element_selector,
+                block_resources=request.block_resources,
+                force_browser=request.force_browser,
+                extract_text=request.extract_text,
+                include_html=request.include_html,
+                wait_for_network_idle=request.wait_for_network_idle,
+                timeouts=_crawl_timeouts
+            )
         
-        logger.info(f"Crawl for {request.url} finished with status: {result.get('status')}")
+        logger.info("Crawl for %s finished with status: %s", request.url, result.get('status'))
         return result
         
     except Exception as e:
-        logger.exception(f"Unhandled exception during crawl request for {request.url}: {e}")
-        return WebCrawlerResponse(
-            url=str(request.url),
-            status="error",
-            error=f"Internal Server Error: {str(e)}",
-            title=None,
-            text=None,
-            html=None,
-            extracted_content=None,
-            extracted_data=None
-        )
+        logger.exception("Unhandled exception during crawl request for %s: %s", request.url, e)
+        return _crawl_error_response(str(request.url), e)
+
+# 최근 크롤링 결과 캐시 (요청 JSON -> (만료 시각, 결과)). 워커별로 유지되며 내용이 있는 성공 결과만 저장
+_crawl_cache: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+# 진행 중인 크롤링 (같은 요청이 동시에 들어오면 하나의 크롤링 결과를 공유)
+_crawl_inflight: Dict[str, "asyncio.Task"] = {}
+
+def _store_crawl_result(key: str, result: Dict[str, Any]) -> None:
+    # 내비게이션 timeout이나 추출 실패도 status는 "success"이므로, 실제 내용이 있는 결과만 캐시
+    # (빈 결과가 TTL 동안 같은 요청에 계속 반환되지 않도록)
+    if (
+        isinstance(result, dict)
+        and result.get("status") == "success"
+        and any(result.get(field) is not None for field in ("text", "html", "extracted_content"))
+    ):
+        _crawl_cache[key] = (time.monotonic() + settings.CRAWL_CACHE_TTL, result)
+        _crawl_cache.move_to_end(key)
+        while len(_crawl_cache) > settings.CRAWL_CACHE_SIZE:
+            _crawl_cache.popitem(last=False)
+
+async def _crawl_and_cache(key: str, request: WebCrawlerRequest):
+    try:
+        result = await _crawl(request)
+        _store_crawl_result(key, result)
+        return result
+    finally:
+        _crawl_inflight.pop(key, None)
+
+async def _run_crawl(request: WebCrawlerRequest):
+    """
+    동일한 요청은 캐시된 결과를 반환하고, 동시에 들어온 동일 요청은 하나의 크롤링으로 합칩니다.
+    noCache 요청은 캐시와 진행 중인 크롤링을 사용하지 않고 새로 크롤링한 뒤 결과로 캐시를 갱신합니다.
+    """
+    if settings.CRAWL_CACHE_TTL <= 0:
+        return await _crawl(request)
+
+    # 결과에 영향을 주는 모든 필드(URL, 헤더, 셀렉터, 옵션)가 키에 포함됨 (no_cache는 결과와 무관하므로 제외)
+    key = request.model_dump_json(exclude={"no_cache"})
+    if request.no_cache:
+        result = await _crawl(request)
+        _store_crawl_result(key, result)
+        return result
+
+    cached = _crawl_cache.get(key)
+    if cached is not None:
+        if cached[0] > time.monotonic():
+            _crawl_cache.move_to_end(key)
+            logger.info("Serving cached crawl result for URL: %s", request.url)
+            return cached[1]
+        del _crawl_cache[key]
+
+    task = _crawl_inflight.get(key)
+    if task is None:
+        task = _crawl_inflight[key] = asyncio.ensure_future(_crawl_and_cache(key, request))
+    # 한 요청이 취소(연결 끊김)되어도 같은 크롤링을 기다리는 다른 요청에는 영향이 없도록 shield
+    return await asyncio.shield(task)
+
+@app.post("/api/web-crawler/fetch", response_model=WebCrawlerResponse)
+async def fetch_webpage_content(request: WebCrawlerRequest):
+    return await _run_crawl(request)
+
+@app.post("/api/web-crawler/fetch-batch", response_model=List[WebCrawlerResponse])
+async def fetch_webpage_content_batch(request: BatchCrawlRequest):
+    """
+    여러 URL을 동시에 크롤링합니다.
+    
+    요청 단위 동시 실행 수는 max_concurrency로 제한되며, 일부 URL이 실패해도
+    나머지 결과는 그대로 반환됩니다 (실패한 항목은 status="error").
+    """
+    logger.info("Received batch crawl request for %s URLs (max_concurrency=%s)", len(request.urls), request.max_concurrency)
+    semaphore = asyncio.Semaphore(request.max_concurrency)
+
+    async def crawl_one(crawl_request: WebCrawlerRequest):
+        async with semaphore:
+            return await _run_crawl(crawl_request)
+
+    results = await asyncio.gather(*(crawl_one(r) for r in request.urls), return_exceptions=True)
+    return [
+        _crawl_error_response(str(crawl_request.url), result) if isinstance(result, BaseException) else result
+        for crawl_request, result in zip(request.urls, results)
+    ]
 
 @app.post("/api/html-parser/parse", response_model=HtmlParseResponse)
 async def parse_html(request: HtmlParseRequest):
@@ -109,23 +263,27 @@ async def parse_html(request: HtmlParseRequest):
     then returns the extracted data according to those rules.
     """
     try:
-        result = parse_html_content(request.html_content, request.extraction_rules)
+        # 파싱은 CPU 작업이므로 이벤트 루프를 막지 않도록 프로세스 풀 (또는 스레드 풀)에서 실행
+        if app.state.parse_pool:
+            result = await _parse_in_pool(request.html_content, request.extraction_rules)
+        else:
+            result = await run_in_threadpool(parse_html_content, request.html_content, request.extraction_rules)
         
         # Check if parsing resulted in an error
         if "error" in result:
-            return HtmlParseResponse(
+            return HtmlParseResponse.model_construct(
                 status="error",
                 error=result["error"]
             )
         
-        return HtmlParseResponse(
+        return HtmlParseResponse.model_construct(
             status="success",
             data=result
         )
     
     except Exception as e:
-        logger.error(f"Error in HTML parsing: {str(e)}")
-        return HtmlParseResponse(
+        logger.error("Error in HTML parsing: %s", e)
+        return HtmlParseResponse.model_construct(
             status="error",
             error=f"Failed to process request: {str(e)}"
         )
@@ -138,35 +296,62 @@ async def upload_file(file: UploadFile = File(...)):
     최대 파일 크기는 10MB입니다.
     """
     try:
-        logger.info(f"File upload request received: {file.filename}")
+        logger.info("File upload request received: %s", file.filename)
         result = await save_uploaded_file(file)
-        logger.info(f"File uploaded successfully: {result['filename']}")
+        logger.info("File uploaded successfully: %s", result['filename'])
         return result
     except HTTPException as e:
         # HTTPException은 이미 적절한 형식이므로 그대로 발생시킴
-        logger.warning(f"File upload validation error: {e.detail}")
+        logger.warning("File upload validation error: %s", e.detail)
         raise
     except Exception as e:
-        logger.error(f"Unexpected error during file upload: {str(e)}")
+        logger.error("Unexpected error during file upload: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to upload file: {str(e)}")
 
+FILE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
 @app.get("/api/files/{filename}")
-async def get_file(filename: str):
+async def get_file(filename: str, request: Request):
     """
     업로드된 파일을 가져옵니다.
+    업로드 파일은 임의 ID로 저장되어 내용이 바뀌지 않으므로 immutable 캐시 헤더와 ETag를 함께 보내며,
+    If-None-Match가 일치하면 파일을 보내지 않고 304를 반환합니다.
     """
     if not file_exists(filename):
-        logger.warning(f"File not found: {filename}")
+        logger.warning("File not found: %s", filename)
         raise HTTPException(status_code=404, detail="File not found")
     
     file_path = get_file_path(filename)
-    logger.info(f"Serving file: {file_path}")
-    return FileResponse(file_path)
+    try:
+        file_stat, etag, media_type = get_file_metadata(filename)
+    except FileNotFoundError:
+        logger.warning("File not found: %s", filename)
+        raise HTTPException(status_code=404, detail="File not found")
+    cache_headers = {"ETag": etag, "Cache-Control": FILE_CACHE_CONTROL}
+    
+    if_none_match = request.headers.get("if-none-match")
+    # If-None-Match는 약한 비교를 사용하므로 W/ 접두사(nginx gzip 등 프록시가 붙임)를 제거하고 비교
+    if if_none_match and (if_none_match.strip() == "*" or etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))):
+        return Response(status_code=304, headers=cache_headers)
+    
+    logger.info("Serving file: %s", file_path)
+    return FileResponse(file_path, media_type=media_type, headers=cache_headers, stat_result=file_stat)
 
 @app.get("/api/files", response_model=List[Dict[str, Any]])
 async def get_files(limit: Optional[int] = 100):
     """
     업로드된 파일 목록을 반환합니다.
     """
-    logger.info(f"Listing files with limit: {limit}")
-    return list_files(limit) 
\ No newline at end of file
+    logger.info("Listing files with limit: %s", limit)
+    return list_files(limit) 
+
+if __name__ == "__main__":
+    import uvicorn
+    # loop="auto"는 uvloop가 없으면 조용히 asyncio로 대체되므로, 명시적으로 import하여 누락 시 즉시 실패시킴
+    import uvloop  # noqa: F401
+    import httptools  # noqa: F401
+
+    # UVICORN_UDS가 설정되면 로컬 리버스 프록시용 UNIX 도메인 소켓에, 아니면 TCP에 바인딩
+    bind = {"uds": settings.UVICORN_UDS} if settings.UVICORN_UDS else {"host": "0.0.0.0", "port": 8000}
+    # 워커마다 자체 브라우저를 소유하므로 CPU 코어 수만큼 워커를 띄움
+    uvicorn.run("main:app", loop="uvloop", http="httptools", workers=os.cpu_count(), **bind)
@@ -0,0 +1,58 @@
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl
+from pydantic.alias_generators import to_camel
+from typing import Optional, Dict, Any, List
+from services.html_parser import ExtractionRule
+
+# API 요청/응답 모델 정의
+# 요청 모델은 필드별 alias 대신 camelCase alias 생성기를 사용하며 (프론트엔드는 camelCase로 전송),
+# populate_by_name으로 snake_case 키도 그대로 허용합니다.
+
+class WebCrawlerRequest(BaseModel):
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    url: HttpUrl
+    wait_for_selector_on_page: Optional[str] = None
+    iframe_selector: Optional[str] = None
+    wait_for_selector_in_iframe: Optional[str] = None
+    timeout: int = 30000
+    headers: Optional[Dict[str, str]] = None
+    extract_element_selector: Optional[str] = None
+    output_format: Optional[str] = 'html'
+    # 차단할 리소스 타입 (None이면 이미지/미디어/폰트 차단, 빈 리스트면 모두 로드)
+    block_resources: Optional[List[str]] = None
+    # True면 정적 HTTP 요청 시도 없이 항상 브라우저로 렌더링
+    force_browser: bool = False
+    # HTML만 필요하면 False로 두어 텍스트 변환을 생략
+    extract_text: bool = True
+    # False면 전체 HTML을 응답에서 제외
+    include_html: bool = True
+    # 네트워크 유휴 대기 여부 (None이면 대기용 셀렉터가 없을 때만 대기)
+    wait_for_network_idle: Optional[bool] = None
+    # True이면 캐시된 결과를 사용하지 않고 새로 크롤링 (새 결과로 캐시를 갱신하며, 캐시 키에는 포함되지 않음)
+    no_cache: bool = False
+
+class WebCrawlerResponse(BaseModel):
+    url: str
+    status: str
+    error: Optional[str] = None
+    title: Optional[str] = None
+    text: Optional[str] = None
+    html: Optional[str] = None
+    extracted_content: Optional[str] = None
+    extracted_data: Optional[Dict[str, Any]] = None
+
+class BatchCrawlRequest(BaseModel):
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    urls: List[WebCrawlerRequest]
+    max_concurrency: int = Field(5, ge=1)
+
+# HTML Parser API
+class HtmlParseRequest(BaseModel):
+    html_content: str
+    extraction_rules: List[ExtractionRule]
+
+class HtmlParseResponse(BaseModel):
+    status: str
+    data: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
@@ -1,71 +1,106 @@
 import os
-import uuid
+import mimetypes
+import heapq
+import functools
+import secrets
 import time
+import zlib
+from pathlib import Path
+import aiofiles
 from fastapi import UploadFile, HTTPException
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 # 기본 설정
 UPLOAD_DIR = "uploads"
+UPLOAD_PATH = Path(UPLOAD_DIR)
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
-ALLOWED_IMAGE_TYPES = [
-    "image/jpeg", "image/png", "image/gif", "image/webp", 
-    "image/svg+xml", "image/bmp", "image/tiff"
-]
+# 허용된 이미지 타입과 저장 시 사용할 확장자 (클라이언트가 보낸 파일명 대신 검증된 타입에서 도출)
+CONTENT_TYPE_TO_EXT = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+    "image/svg+xml": ".svg",
+    "image/bmp": ".bmp",
+    "image/tiff": ".tiff",
+}
+ALLOWED_IMAGE_TYPES = frozenset(CONTENT_TYPE_TO_EXT)
+EXT_TO_CONTENT_TYPE = {ext: content_type for content_type, ext in CONTENT_TYPE_TO_EXT.items()}
+CHUNK_SIZE = 64 * 1024  # 스트리밍 저장 시 한 번에 읽을 바이트 수
+# 파일이 많아져도 디렉토리가 커지지 않도록 uploads/00 ~ uploads/ff 하위 디렉토리에 나누어 저장
+SHARD_DIRS = [f"{i:02x}" for i in range(256)]
 
 def ensure_upload_dir():
-    """업로드 디렉토리가 존재하는지 확인하고, 없으면 생성합니다."""
+    """
+    업로드 디렉토리가 존재하는지 확인하고, 없으면 생성합니다.
+    앱 시작 시 한 번만 호출됩니다.
+    """
     os.makedirs(UPLOAD_DIR, exist_ok=True)
+    for shard in SHARD_DIRS:
+        os.makedirs(os.path.join(UPLOAD_DIR, shard), exist_ok=True)
 
-async def validate_image_file(file: UploadFile) -> None:
+def get_shard(filename: str) -> str:
+    """파일명으로부터 저장될 샤드 디렉토리 이름 (00 ~ ff)을 계산합니다."""
+    return f"{zlib.crc32(filename.encode()) & 0xff:02x}"
+
+def validate_image_file(file: UploadFile) -> None:
     """
-    이미지 파일의 유효성을 검사합니다.
-    - 파일 크기 제한 (10MB)
-    - 허용된 이미지 타입만 가능
+    이미지 파일의 타입을 검사합니다.
+    파일 크기 제한 (10MB)은 저장 시 스트리밍하면서 검사합니다.
     """
-    # 파일 타입 확인
     if file.content_type not in ALLOWED_IMAGE_TYPES:
         raise HTTPException(
             status_code=400, 
             detail=f"Unsupported file type: {file.content_type}. Only images are allowed."
         )
-    
-    # 파일 크기 확인을 위해 파일 내용 읽기
-    file_content = await file.read()
-    file_size = len(file_content)
-    
-    # 파일 위치 되돌리기 (읽은 후 위치 초기화)
-    await file.seek(0)
-    
-    # 파일 크기 검사
-    if file_size > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"File too large: {file_size} bytes. Maximum allowed size is {MAX_FILE_SIZE} bytes (10MB)."
-        )
 
 async def save_uploaded_file(file: UploadFile) -> Dict[str, Any]:
     """
     파일을 서버에 저장하고 메타데이터를 반환합니다.
+    파일 전체를 메모리에 올리지 않고 청크 단위로 디스크에 기록하며,
+    크기 제한을 초과하는 즉시 중단합니다.
     """
-    # 디렉토리 확인
-    ensure_upload_dir()
-    
-    # 파일 유효성 검사
-    await validate_image_file(file)
+    # 파일 타입 검사 (대상 파일을 열기 전에 수행)
+    validate_image_file(file)
     
     # 파일 ID 및 안전한 파일명 생성
-    file_id = str(uuid.uuid4())
+    file_id = secrets.token_urlsafe(16)
     original_filename = file.filename or "unnamed_file"
-    file_ext = os.path.splitext(original_filename)[1]
+    file_ext = CONTENT_TYPE_TO_EXT[file.content_type]
     safe_filename = f"{file_id}{file_ext}"
     
     # 파일 저장 경로
-    file_path = os.path.join(UPLOAD_DIR, safe_filename)
+    file_path = os.path.join(UPLOAD_DIR, get_shard(safe_filename), safe_filename)
+    
+    # 파일을 청크 단위로 저장하면서 크기 검사
+    total_size = 0
+    try:
+        # aiofiles로 기록하여 디스크 쓰기 동안 이벤트 루프가 멈추지 않도록 함
+        try:
+            f = await aiofiles.open(file_path, "wb")
+        except FileNotFoundError:
+            # 시작 후 샤드 디렉토리가 삭제된 경우에만 재생성
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            f = await aiofiles.open(file_path, "wb")
+        try:
+            while chunk := await file.read(CHUNK_SIZE):
+                total_size += len(chunk)
+                if total_size > MAX_FILE_SIZE:
+                    raise HTTPException(
+                        status_code=400, 
+                        detail=f"File too large: exceeds maximum allowed size of {MAX_FILE_SIZE} bytes (10MB)."
+                    )
+                await f.write(chunk)
+        finally:
+            await f.close()
+    except BaseException:
+        # 실패 시 부분적으로 기록된 파일 제거
+        if os.path.exists(file_path):
+            os.unlink(file_path)
+        raise
     
-    # 파일 저장
-    with open(file_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
+    # 샤드 디렉토리에 저장해도 업로드 디렉토리의 mtime은 바뀌지 않으므로 명시적으로 갱신하여 목록 캐시를 무효화
+    invalidate_list_cache()
     
     # 파일 메타데이터 반환
     return {
@@ -75,47 +110,130 @@ async def save_uploaded_file(file: UploadFile) -> Dict[str, Any]:
         "path": file_path,
         "url": f"/api/files/{safe_filename}",
         "contentType": file.content_type,
-        "size": os.path.getsize(file_path),
+        "size": total_size,
         "uploadedAt": time.time()
     }
 
-def get_file_path(filename: str) -> str:
+def is_safe_filename(filename: str) -> bool:
+    """
+    파일명에 경로 구분자나 상위 디렉토리 참조가 없는지 확인합니다.
+    """
+    return bool(filename) and "/" not in filename and "\\" not in filename and ".." not in filename
+
+@functools.lru_cache(maxsize=4096)
+def _resolve_file_path(filename: str) -> Path:
+    """
+    실제로 존재하는 파일 경로를 찾습니다. 샤딩 이전에 업로드된 파일은 업로드 디렉토리 최상위에 있습니다.
+    찾지 못하면 FileNotFoundError를 발생시키며, lru_cache는 예외를 캐시하지 않으므로
+    존재하는 경로만 캐시됩니다 (다른 워커가 나중에 업로드한 파일도 바로 찾을 수 있음).
+    """
+    for path in (UPLOAD_PATH / get_shard(filename) / filename, UPLOAD_PATH / filename):
+        if path.is_file():
+            return path
+    raise FileNotFoundError(filename)
+
+def get_file_path(filename: str) -> Path:
     """
     파일명으로부터 전체 파일 경로를 반환합니다.
     """
-    return os.path.join(UPLOAD_DIR, filename)
+    try:
+        return _resolve_file_path(filename)
+    except FileNotFoundError:
+        return UPLOAD_PATH / get_shard(filename) / filename
 
 def file_exists(filename: str) -> bool:
     """
     파일이 존재하는지 확인합니다.
     """
-    file_path = get_file_path(filename)
-    return os.path.exists(file_path)
+    if not is_safe_filename(filename):
+        return False
+    try:
+        _resolve_file_path(filename)
+        return True
+    except FileNotFoundError:
+        return False
+
+@functools.lru_cache(maxsize=4096)
+def _file_serving_meta(filename: str, mtime_ns: int, size: int) -> Tuple[str, Optional[str]]:
+    """
+    파일의 ETag와 media type을 계산합니다.
+    mtime과 크기가 키에 포함되므로 파일이 바뀌면 새로 계산되고, 오래된 항목은 LRU로 제거됩니다.
+    """
+    etag = f'"{mtime_ns:x}-{size:x}"'
+    ext = os.path.splitext(filename)[1].lower()
+    media_type = EXT_TO_CONTENT_TYPE.get(ext) or mimetypes.guess_type(filename)[0]
+    return etag, media_type
+
+def get_file_metadata(filename: str) -> Tuple[os.stat_result, str, Optional[str]]:
+    """
+    파일 서빙에 필요한 stat 결과, ETag, media type을 반환합니다.
+    stat은 한 번만 수행하며, mtime과 크기가 같으면 ETag와 media type은 캐시된 값을 재사용합니다.
+    """
+    file_stat = os.stat(get_file_path(filename))
+    etag, media_type = _file_serving_meta(filename, file_stat.st_mtime_ns, file_stat.st_size)
+    return file_stat, etag, media_type
+
+# list_files 결과 캐시: (업로드 디렉토리의 mtime_ns, limit, 결과)
+_list_cache: Optional[Tuple[int, Optional[int], List[Dict[str, Any]]]] = None
+_LIST_DIRS = [UPLOAD_DIR] + [os.path.join(UPLOAD_DIR, shard) for shard in SHARD_DIRS]
+
+def invalidate_list_cache() -> None:
+    """
+    list_files 캐시를 무효화합니다.
+    업로드 디렉토리의 mtime도 갱신하므로 다른 워커 프로세스의 캐시도 다음 조회 시 무효화됩니다.
+    """
+    global _list_cache
+    _list_cache = None
+    try:
+        os.utime(UPLOAD_DIR)
+    except FileNotFoundError:
+        pass
 
 def list_files(limit: Optional[int] = None) -> List[Dict[str, Any]]:
     """
     업로드된 파일 목록을 반환합니다.
+    업로드 디렉토리의 mtime이 바뀌지 않았다면 캐시된 결과를 그대로 반환합니다.
+    (샤드 디렉토리에 저장할 때마다 save_uploaded_file이 업로드 디렉토리의 mtime을 갱신함)
     """
-    ensure_upload_dir()
-    files = []
+    global _list_cache
+    
+    try:
+        dir_mtime = os.stat(UPLOAD_DIR).st_mtime_ns
+    except FileNotFoundError:
+        # 시작 후 업로드 디렉토리가 삭제된 경우에만 재생성 (디렉토리는 앱 시작 시 생성됨)
+        ensure_upload_dir()
+        dir_mtime = os.stat(UPLOAD_DIR).st_mtime_ns
+    if _list_cache is not None and _list_cache[0] == dir_mtime and _list_cache[1] == limit:
+        return list(_list_cache[2])
     
-    for filename in os.listdir(UPLOAD_DIR):
-        file_path = os.path.join(UPLOAD_DIR, filename)
-        if os.path.isfile(file_path):
-            file_stat = os.stat(file_path)
-            files.append({
-                "filename": filename,
-                "path": file_path,
-                "url": f"/api/files/{filename}",
-                "size": file_stat.st_size,
-                "createdAt": file_stat.st_ctime
-            })
+    # scandir은 디렉토리 엔트리의 타입 정보를 재사용하므로 listdir + isfile보다 syscall이 적음
+    entries = []
+    for path in _LIST_DIRS:
+        try:
+            it = os.scandir(path)
+        except FileNotFoundError:
+            # 삭제된 샤드 디렉토리는 비어 있는 것으로 취급 (다음 저장 시 재생성됨)
+            continue
+        with it:
+            entries.extend((entry.name, entry.path, entry.stat()) for entry in it if entry.is_file())
     
-    # 최신 파일 순으로 정렬
-    files.sort(key=lambda x: x["createdAt"], reverse=True)
+    # 최신 파일 순으로 정렬 (limit이 있으면 상위 limit개만 선택)
+    sort_key = lambda item: item[2].st_ctime
+    if limit and len(entries) > limit:
+        entries = heapq.nlargest(limit, entries, key=sort_key)
+    else:
+        entries.sort(key=sort_key, reverse=True)
     
-    # 제한된 수의 파일만 반환
-    if limit and len(files) > limit:
-        return files[:limit]
+    files = [
+        {
+            "filename": filename,
+            "path": file_path,
+            "url": f"/api/files/{filename}",
+            "size": file_stat.st_size,
+            "createdAt": file_stat.st_ctime
+        }
+        for filename, file_path, file_stat in entries
+    ]
     
-    return files 
\ No newline at end of file
+    _list_cache = (dir_mtime, limit, files)
+    return list(files)
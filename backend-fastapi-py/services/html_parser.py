@@ -1,6 +1,6 @@
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Callable
 from pydantic import BaseModel, Field
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 import logging
 
 # 로깅 설정
@@ -14,31 +14,31 @@ class ExtractionRule(BaseModel):
     attribute_name: Optional[str] = Field(None, description="target이 'attribute'일 때 추출할 HTML 속성의 이름")
     multiple: bool = Field(False, description="여러 요소 추출 여부 (true: 배열 반환, false: 단일 값 반환)")
 
-def extract_element_data(element, target: str, attribute_name: Optional[str] = None) -> Union[str, None]:
+def _unsupported_target(element) -> None:
+    return None
+
+def make_extractor(target: str, attribute_name: Optional[str] = None) -> Callable[[Any], Optional[str]]:
     """
-    선택된 HTML 요소에서 지정된 대상 데이터를 추출합니다.
+    추출 대상에 맞는 추출 함수를 한 번만 결정하여 반환합니다.
+    규칙마다 한 번 호출하고, 매칭된 모든 요소에 같은 함수를 적용합니다.
     
     Args:
-        element: BeautifulSoup 요소
         target: 추출 대상 타입 ('text', 'html', 'attribute')
         attribute_name: target이 'attribute'일 때 추출할 속성 이름
         
     Returns:
-        추출된 데이터 문자열 또는 None
+        selectolax (Lexbor) 노드를 받아 추출된 문자열 또는 None을 반환하는 함수
     """
-    try:
-        if target == "text":
-            return element.get_text(strip=True)
-        elif target == "html":
-            return str(element)
-        elif target == "attribute" and attribute_name:
-            return element.get(attribute_name, "")
-        else:
-            logger.warning(f"지원하지 않는 추출 대상: {target}")
-            return None
-    except Exception as e:
-        logger.error(f"요소 데이터 추출 중 오류: {str(e)}")
-        return None
+    if target == "text":
+        return lambda element: element.text(strip=True)
+    elif target == "html":
+        return lambda element: element.html
+    elif target == "attribute" and attribute_name:
+        # 값이 없는 속성 (예: disabled)은 None으로 반환되므로 빈 문자열로 통일
+        return lambda element: element.attributes.get(attribute_name) or ""
+    else:
+        logger.warning("지원하지 않는 추출 대상: %s", target)
+        return _unsupported_target
 
 def parse_html_content(html_string: str, rules: List[ExtractionRule]) -> Dict[str, Any]:
     """
@@ -57,44 +57,51 @@ def parse_html_content(html_string: str, rules: List[ExtractionRule]) -> Dict[st
             logger.error("유효하지 않은 HTML 입력")
             return {"error": "유효하지 않은 HTML 입력"}
         
-        # BeautifulSoup을 사용하여 HTML 파싱 (lxml 파서 사용)
-        soup = BeautifulSoup(html_string, 'lxml')
+        # selectolax (Lexbor) 로 HTML 파싱 - DOM과 CSS 선택자 엔진이 모두 C로 구현되어 있음
+        tree = LexborHTMLParser(html_string)
         
         # 결과 딕셔너리 초기화
         result = {}
         
+        # 같은 선택자를 쓰는 규칙이 여러 개일 때 (예: 같은 링크의 text와 href) 문서를 한 번만 탐색하도록
+        # 선택자별 매칭 결과를 이 문서 범위에서 재사용
+        matches: Dict[str, list] = {}
+        
         # 각 규칙에 따라 데이터 추출
         for rule in rules:
             try:
-                # multiple 값에 따라 select() 또는 select_one() 사용
+                extract = make_extractor(rule.target, rule.attribute_name)
+                
+                # multiple 값에 따라 css() 또는 css_first() 사용
                 if rule.multiple:
-                    elements = soup.select(rule.selector)
-                    # 각 요소에서 데이터 추출하여 배열로 저장
-                    result[rule.name] = [
-                        extract_element_data(el, rule.target, rule.attribute_name)
-                        for el in elements
-                    ]
-                    # None 값 필터링
-                    result[rule.name] = [item for item in result[rule.name] if item is not None]
+                    elements = matches.get(rule.selector)
+                    if elements is None:
+                        elements = matches[rule.selector] = tree.css(rule.selector)
+                    # 각 요소에서 데이터 추출하여 배열로 저장 (None 값은 바로 제외)
+                    result[rule.name] = [value for el in elements if (value := extract(el)) is not None]
                     
-                    logger.info(f"규칙 '{rule.name}': {len(elements)}개 요소 추출됨")
+                    logger.debug("규칙 '%s': %s개 요소 추출됨", rule.name, len(elements))
                 else:
                     # 단일 요소 추출
-                    element = soup.select_one(rule.selector)
+                    if rule.selector in matches:
+                        cached = matches[rule.selector]
+                        element = cached[0] if cached else None
+                    else:
+                        element = tree.css_first(rule.selector)
                     if element:
-                        result[rule.name] = extract_element_data(element, rule.target, rule.attribute_name)
-                        logger.info(f"규칙 '{rule.name}': 요소 추출 성공")
+                        result[rule.name] = extract(element)
+                        logger.debug("규칙 '%s': 요소 추출 성공", rule.name)
                     else:
                         result[rule.name] = None
-                        logger.warning(f"규칙 '{rule.name}': 선택자 '{rule.selector}'와 일치하는 요소 없음")
+                        logger.warning("규칙 '%s': 선택자 '%s'와 일치하는 요소 없음", rule.name, rule.selector)
             except Exception as rule_error:
                 # 개별 규칙 처리 중 오류 발생 시, 오류 메시지를 결과에 포함하고 계속 진행
-                logger.error(f"규칙 '{rule.name}' 처리 중 오류: {str(rule_error)}")
+                logger.error("규칙 '%s' 처리 중 오류: %s", rule.name, rule_error)
                 result[rule.name] = {"error": str(rule_error)}
         
         return result
         
     except Exception as e:
         # 전체 파싱 처리 중 오류 발생 시
-        logger.error(f"HTML 파싱 중 오류: {str(e)}")
+        logger.error("HTML 파싱 중 오류: %s", e)
         return {"error": f"HTML 파싱 중 오류: {str(e)}"} 
\ No newline at end of file
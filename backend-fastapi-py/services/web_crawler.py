@@ -1,82 +1,229 @@
 import asyncio
 import logging
-from typing import Dict, Optional, Any, List, Union
-from playwright.async_api import async_playwright, Error as PlaywrightError, Page, Browser, Frame
-import json
 import re
-from bs4 import BeautifulSoup
+import time
+from types import MappingProxyType
+from typing import Dict, Optional, Any, Union, Collection, Mapping, NamedTuple, Tuple
+import httpx
+from playwright.async_api import async_playwright, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError, Page, Browser, BrowserContext, Frame, Playwright, Route
+from selectolax.lexbor import LexborHTMLParser
 
 # Removed basicConfig from here
 # logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Resource types the crawler never needs: it only reads the DOM and its text.
+# Stylesheets are not blocked by default because innerText and visibility waits depend on CSS.
+DEFAULT_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+
+# Blocked requests are answered locally with a tiny valid body instead of being aborted:
+# aborts surface as load errors that some pages retry. Images get a 1x1 transparent GIF.
+_BLOCKED_RESPONSE_BODIES: Dict[str, tuple[bytes, str]] = {
+    "image": (b"GIF89a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff!\xf9\x04\x01\x00\x00\x00\x00,\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x01D\x00;", "image/gif"),
+    "stylesheet": (b"", "text/css"),
+}
+_EMPTY_BLOCKED_RESPONSE = (b"", "application/octet-stream")
+
+# Docker gives containers a 64MB /dev/shm, which Chromium outgrows on large pages, and
+# headless server runs have no GPU. (Playwright already runs Chromium without its sandbox.)
+BROWSER_LAUNCH_ARGS = ["--disable-dev-shm-usage", "--disable-gpu"]
+
+# A line break plus the whitespace and blank lines around it, collapsed to a single "\n".
+# This strips every line and drops empty ones in one C-level pass; like str.strip(), it also
+# treats Unicode whitespace (\xa0, \u3000, \r, ...) as blank.
+_LINE_BREAKS_RE = re.compile(r"[^\S\n]*\n\s*")
+
+# Read-only because it is handed to Playwright/httpx as-is when the caller adds no headers
+DEFAULT_HEADERS: Mapping[str, str] = MappingProxyType({
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7"
+})
+
+# A static response with less visible text than this is treated as a JS-rendered shell
+MIN_STATIC_TEXT_LENGTH = 200
+# Static responses larger than this are left to the browser instead of being read into memory
+MAX_STATIC_BODY_BYTES = 5 * 1024 * 1024
+
+# <meta charset="..."> or <meta http-equiv="Content-Type" content="...; charset=...">,
+# looked for in the first bytes of the document the way browsers prescan it
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([A-Za-z0-9_.:-]+)""", re.IGNORECASE)
+_META_PRESCAN_BYTES = 1024
+# Labels browsers decode with a superset codec (WHATWG Encoding Standard)
+_BROWSER_CODECS = {
+    "euc-kr": "cp949", "ks_c_5601-1987": "cp949", "windows-949": "cp949",
+    "iso-8859-1": "cp1252", "latin1": "cp1252", "us-ascii": "cp1252", "ascii": "cp1252",
+    "gb2312": "gb18030", "gbk": "gb18030",
+    "shift_jis": "cp932", "sjis": "cp932",
+}
+
+class CrawlTimeouts(NamedTuple):
+    """
+    How crawl_webpage splits its total timeout between the steps (fractions of `timeout`).
+    Finding the iframe element gets a short fixed budget instead.
+    """
+    static_fetch_fraction: float = 0.25
+    nav_fraction: float = 0.6
+    page_wait_fraction: float = 0.1
+    iframe_wait_fraction: float = 0.15
+    iframe_find_ms: int = 5000
+    # Share of the navigation budget reserved for the optional network-idle wait
+    network_idle_fraction: float = 0.2
+
+DEFAULT_CRAWL_TIMEOUTS = CrawlTimeouts()
+
 # --- Private Helper Functions --- 
 
-async def _setup_browser_and_page(headless: bool = True) -> tuple[Browser, Page]:
-    """Launches browser and creates a new page."""
+async def launch_browser(headless: bool = True) -> tuple[Playwright, Browser]:
+    """Starts Playwright and launches a Chromium browser that can be shared across crawls."""
     p = await async_playwright().start()
-    browser = await p.chromium.launch(headless=headless)
-    page = await browser.new_page()
-    logger.info("Browser and page initialized.")
-    return browser, page
-
-async def _set_page_headers(page: Page, headers: Optional[Dict[str, str]]):
-    """Sets extra HTTP headers for the page."""
-    default_headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-        "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7"
-    }
+    try:
+        browser = await p.chromium.launch(headless=headless, args=BROWSER_LAUNCH_ARGS)
+    except Exception:
+        await p.stop()
+        raise
+    logger.info("Playwright browser launched.")
+    return p, browser
+
+async def close_browser(p: Optional[Playwright], browser: Optional[Browser]):
+    """Closes a browser and stops the Playwright instance that launched it."""
+    if browser:
+        logger.info("Closing browser.")
+        await browser.close()
+    if p:
+        await p.stop()
+
+# Process-wide shared browser. Each crawl opens its own (cheap) BrowserContext on it
+# instead of paying the Chromium launch cost per call.
+_playwright: Optional[Playwright] = None
+_browser: Optional[Browser] = None
+_browser_lock: Optional[asyncio.Lock] = None
+
+async def get_browser() -> Browser:
+    """Returns the shared browser, launching (or relaunching after a crash) it on first use."""
+    global _playwright, _browser, _browser_lock
+    if _browser is not None and _browser.is_connected():
+        return _browser
+    if _browser_lock is None:
+        _browser_lock = asyncio.Lock()
+    async with _browser_lock:
+        if _browser is None or not _browser.is_connected():
+            await close_browser(_playwright, None)
+            _playwright, _browser = None, None
+            _playwright, _browser = await launch_browser()
+    return _browser
+
+async def shutdown_browser():
+    """Closes the shared browser. Call once on application shutdown."""
+    global _playwright, _browser
+    playwright, browser = _playwright, _browser
+    _playwright, _browser = None, None
+    await close_browser(playwright, browser)
+
+# Process-wide HTTP client for the static fast path (keeps connections alive across crawls)
+_http_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """Returns the shared HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(follow_redirects=True)
+    return _http_client
+
+async def close_http_client():
+    """Closes the shared HTTP client. Call once on application shutdown."""
+    global _http_client
+    client, _http_client = _http_client, None
+    if client is not None:
+        await client.aclose()
+
+def _merge_headers(headers: Optional[Dict[str, str]]) -> Mapping[str, str]:
+    """Returns the default headers overridden by the caller's headers."""
     if headers:
-        default_headers.update(headers)
-        logger.info(f"Using custom headers: {list(headers.keys())}")
-    else:
-        logger.info("Using default headers.")
-    await page.set_extra_http_headers(default_headers)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Using custom headers: %s", list(headers.keys()))
+        return {**DEFAULT_HEADERS, **headers}
+    logger.info("Using default headers.")
+    return DEFAULT_HEADERS
+
+async def _setup_context_and_page(
+    browser: Browser,
+    block_resources: Collection[str] = DEFAULT_BLOCKED_RESOURCE_TYPES,
+    headers: Optional[Dict[str, str]] = None,
+) -> tuple[BrowserContext, Page]:
+    """
+    Creates an isolated browser context and a new page for a single crawl.
+    The headers are set on the context when it is created, so no separate
+    set_extra_http_headers round-trip is needed per page.
+    """
+    context = await browser.new_context(extra_http_headers=_merge_headers(headers))
+    if block_resources:
+        blocked = frozenset(block_resources)
 
-async def _navigate_and_wait(page: Page, url: str, timeout: int):
-    """Navigates to the URL and waits for load states."""
-    logger.info(f"Navigating to {url}")
-    navigation_timeout = timeout * 0.8
+        async def _filter_resources(route: Route):
+            resource_type = route.request.resource_type
+            if resource_type in blocked:
+                body, content_type = _BLOCKED_RESPONSE_BODIES.get(resource_type, _EMPTY_BLOCKED_RESPONSE)
+                await route.fulfill(status=200, body=body, content_type=content_type)
+            else:
+                await route.continue_()
+
+        await context.route("**/*", _filter_resources)
+    page = await context.new_page()
+    logger.info("Browser context and page initialized.")
+    return context, page
+
+async def _navigate_and_wait(page: Page, url: str, timeout: int, idle_timeout: int, wait_for_network_idle: bool = True):
+    """
+    Navigates to the URL and waits for DOMContentLoaded.
+    The extra network-idle wait (`idle_timeout`, carved out of `timeout`) is only done when
+    requested (by default, when the caller has no selector telling us when the content is ready).
+    """
+    logger.info("Navigating to %s", url)
+    # goto returns at DOMContentLoaded either way, so it never needs the idle share
+    navigation_timeout = timeout - idle_timeout
     try:
         await page.goto(url, wait_until="domcontentloaded", timeout=navigation_timeout)
-        logger.info(f"Navigation complete, waiting for network idle (timeout: {timeout * 0.2}ms)")
-        await page.wait_for_load_state("networkidle", timeout=timeout * 0.2)
-        logger.info("Network is idle.")
+        if wait_for_network_idle:
+            logger.info("Navigation complete, waiting for network idle (timeout: %sms)", idle_timeout)
+            await page.wait_for_load_state("networkidle", timeout=idle_timeout)
+            logger.info("Network is idle.")
+        else:
+            logger.info("Navigation complete, skipping network idle wait.")
+    except PlaywrightTimeoutError as nav_err:
+        logger.warning("Timeout during navigation or network idle wait: %s", nav_err)
     except PlaywrightError as nav_err:
-        if "net::ERR_ABORTED" in str(nav_err):
-             logger.warning(f"Navigation request aborted, possibly due to client-side redirect or script interference. Proceeding cautiously.")
-        elif "Timeout" in str(nav_err):
-             logger.warning(f"Timeout during navigation or network idle wait: {str(nav_err)}")
+        if "net::ERR_ABORTED" in nav_err.message:
+             logger.warning("Navigation request aborted, possibly due to client-side redirect or script interference. Proceeding cautiously.")
         else:
-             logger.error(f"Navigation error for {url}: {str(nav_err)}")
+             logger.error("Navigation error for %s: %s", url, nav_err)
              raise
     except Exception as e:
-        logger.error(f"Unexpected error during navigation/wait for {url}: {str(e)}")
+        logger.error("Unexpected error during navigation/wait for %s: %s", url, e)
         raise
 
-async def _find_target_frame(page: Page, iframe_selector: Optional[str]) -> Union[Page, Frame]:
+async def _find_target_frame(page: Page, iframe_selector: Optional[str], timeout: int = DEFAULT_CRAWL_TIMEOUTS.iframe_find_ms) -> Union[Page, Frame]:
     """Finds the target iframe or returns the main page."""
     if not iframe_selector:
         logger.info("No iframe selector provided, using main page context.")
         return page
 
-    logger.info(f"Attempting to find iframe with selector: {iframe_selector}")
+    logger.info("Attempting to find iframe with selector: %s", iframe_selector)
     try:
-        iframe_element = await page.wait_for_selector(iframe_selector, state="attached", timeout=5000)
+        iframe_element = await page.wait_for_selector(iframe_selector, state="attached", timeout=timeout)
         if iframe_element:
             frame = await iframe_element.content_frame()
             if frame:
-                logger.info(f"Successfully found and switched context to iframe: {iframe_selector}")
+                logger.info("Successfully found and switched context to iframe: %s", iframe_selector)
                 return frame
             else:
-                logger.warning(f"Found iframe element for '{iframe_selector}', but could not get content frame.")
+                logger.warning("Found iframe element for '%s', but could not get content frame.", iframe_selector)
         else:
-             logger.warning(f"Iframe element not found for selector '{iframe_selector}' within timeout.")
+             logger.warning("Iframe element not found for selector '%s' within timeout.", iframe_selector)
 
     except PlaywrightError as e:
-        logger.warning(f"Error finding or waiting for iframe '{iframe_selector}': {str(e)}. Falling back to main page context.")
+        logger.warning("Error finding or waiting for iframe '%s': %s. Falling back to main page context.", iframe_selector, e)
     except Exception as e:
-         logger.error(f"Unexpected error getting iframe context '{iframe_selector}': {str(e)}. Falling back to main page context.")
+         logger.error("Unexpected error getting iframe context '%s': %s. Falling back to main page context.", iframe_selector, e)
 
     return page
 
@@ -85,87 +232,341 @@ async def _wait_for_optional_selector(context: Union[Page, Frame], selector: Opt
     if not selector:
         return
 
-    logger.info(f"[{context_name}] Waiting for selector: {selector}")
+    logger.info("[%s] Waiting for selector: %s", context_name, selector)
     try:
         # Use a portion of the *remaining* timeout logically allocated to this step
         # This requires careful timeout management in the main function
         selector_timeout = timeout # Pass the allocated timeout directly
         await context.wait_for_selector(selector, state="visible", timeout=selector_timeout)
-        logger.info(f"[{context_name}] Selector '{selector}' found and visible.")
+        logger.info("[%s] Selector '%s' found and visible.", context_name, selector)
+    except PlaywrightTimeoutError:
+        logger.warning("[%s] Selector '%s' did not appear or become visible within timeout (%sms).", context_name, selector, selector_timeout)
     except PlaywrightError as pe:
-        if "Timeout" in str(pe):
-            logger.warning(f"[{context_name}] Selector '{selector}' did not appear or become visible within timeout ({selector_timeout}ms).")
-        else:
-            logger.error(f"[{context_name}] Playwright error waiting for selector '{selector}': {str(pe)}")
-            # Decide if this should be a fatal error for the crawl
-            # raise pe # Optional: re-raise to fail the crawl
+        logger.error("[%s] Playwright error waiting for selector '%s': %s", context_name, selector, pe)
+        # Decide if this should be a fatal error for the crawl
+        # raise pe # Optional: re-raise to fail the crawl
     except Exception as e:
-        logger.error(f"[{context_name}] Unexpected error waiting for selector '{selector}': {str(e)}")
+        logger.error("[%s] Unexpected error waiting for selector '%s': %s", context_name, selector, e)
         # raise e # Optional: re-raise unexpected errors
 
-async def _extract_content(context: Union[Page, Frame], include_html: bool) -> tuple[Optional[str], Optional[str], Optional[str]]:
-    """Extracts page title (main page only), text content, and optionally HTML from the context."""
+# Elements whose content is never rendered as page text
+_NON_TEXT_ELEMENTS = ["script", "style", "noscript", "template"]
+
+def _html_to_text(page_content: str) -> str:
+    """Converts an HTML document to its visible text, one text node per line."""
+    return _tree_to_text(LexborHTMLParser(page_content))
+
+def _tree_to_text(tree: LexborHTMLParser) -> str:
+    """Visible text of a parsed document. Strips the non-rendered elements from `tree` in place."""
+    # Drop non-rendered elements, then put each text node on its own line (comments are
+    # not text nodes) and normalize the line breaks
+    tree.strip_tags(_NON_TEXT_ELEMENTS)
+    if tree.root is None:
+        return ""
+    return _LINE_BREAKS_RE.sub('\n', tree.root.text(separator='\n')).strip()
+
+# Runs every CSS selector in a single page.evaluate round-trip. Selectors that the DOM
+# rejects (e.g. Playwright-only syntax such as "text=..." or "xpath=...") are reported
+# back as null so they can be retried through the Playwright selector engine; so are
+# empty results, since querySelectorAll does not look into shadow roots.
+_EXTRACT_SELECTORS_JS = """
+(pairs) => {
+    const out = {};
+    for (const [name, selector] of pairs) {
+        try {
+            out[name] = Array.from(
+                document.querySelectorAll(selector),
+                (el) => (el.innerText ?? el.textContent ?? "").trim()
+            );
+        } catch (e) {
+            out[name] = null;
+        }
+    }
+    return out;
+}
+"""
+
+# Title, serialized HTML (same as page.content()), innerText and selector texts in one
+# round-trip instead of one CDP call each
+_EXTRACT_PAGE_JS = f"""
+({{ includeHtml, innerText, pairs }}) => {{
+    let html = null;
+    if (includeHtml) {{
+        html = document.doctype ? new XMLSerializer().serializeToString(document.doctype) : "";
+        if (document.documentElement) html += document.documentElement.outerHTML;
+    }}
+    return {{
+        title: document.title,
+        html,
+        text: innerText ? (document.body ? document.body.innerText : "") : null,
+        selectors: pairs.length ? ({_EXTRACT_SELECTORS_JS.strip()})(pairs) : null,
+    }};
+}}
+"""
+
+async def _extract_content(
+    context: Union[Page, Frame],
+    include_html: bool,
+    extract_text: bool = True,
+    selectors: Optional[Dict[str, str]] = None,
+) -> tuple[Optional[str], Optional[str], Optional[str], Optional[Dict[str, Optional[list]]]]:
+    """
+    Extracts page title (main page only), and optionally text content and HTML from the context.
+    Texts for `selectors` are collected in the same evaluate call and returned last, to be
+    passed on to _extract_selectors_data.
+    """
     title: Optional[str] = None
     text: Optional[str] = None
     html: Optional[str] = None
+    selector_texts: Optional[Dict[str, Optional[list]]] = None
     context_type = "Page" if isinstance(context, Page) else f"Frame({context.name or context.url[:50]})"
 
-    if isinstance(context, Page):
-        try:
-            title = await context.title()
-        except Exception as title_e:
-            logger.warning(f"Could not get page title: {str(title_e)}")
-
     try:
-        page_content = await context.content()
+        data = await context.evaluate(_EXTRACT_PAGE_JS, {
+            # No HTML wanted: let the renderer produce the text (script/style are already
+            # excluded from innerText) instead of serializing and re-parsing the DOM
+            "includeHtml": include_html,
+            "innerText": extract_text and not include_html,
+            "pairs": list(selectors.items()) if selectors else [],
+        })
+        if isinstance(context, Page):
+            title = data["title"]
+        selector_texts = data["selectors"]
+
         if include_html:
-            html = page_content
-            logger.info(f"[{context_type}] HTML content captured (length: {len(html)})")
-        
-        soup = BeautifulSoup(page_content, 'lxml' if 'lxml' in globals() else 'html.parser') 
-        for script in soup(["script", "style"]):
-            script.extract()
-        raw_text = soup.get_text(separator='\n', strip=True)
-        text = '\n'.join(line for line in raw_text.splitlines() if line.strip())
-        logger.info(f"[{context_type}] Text content extracted (length: {len(text) if text else 0})")
+            html = data["html"]
+            logger.info("[%s] HTML content captured (length: %s)", context_type, len(html))
+            if extract_text:
+                # The HTML is serialized anyway, so derive the text from it in one Lexbor pass
+                # (in a worker thread, so other crawls on this loop are not blocked meanwhile)
+                text = await asyncio.to_thread(_html_to_text, html)
+        elif extract_text:
+            text = _LINE_BREAKS_RE.sub('\n', data["text"]).strip()
+        if text is not None:
+            logger.info("[%s] Text content extracted (length: %s)", context_type, len(text))
 
     except Exception as content_e:
-        logger.error(f"[{context_type}] Error extracting content: {str(content_e)}")
+        logger.error("[%s] Error extracting content: %s", context_type, content_e)
 
-    return title, text, html
+    return title, text, html, selector_texts
+
+_ELEMENT_TEXTS_JS = '(els) => els.map((el) => (el.innerText ?? el.textContent ?? "").trim())'
+
+# querySelector + innerHTML in one round-trip; null means the DOM rejected the selector.
+# document.querySelector does not look into shadow roots, so a miss is not final either.
+_EXTRACT_ELEMENT_JS = """
+(selector) => {
+    try {
+        const el = document.querySelector(selector);
+        return { html: el ? el.innerHTML : null };
+    } catch (e) {
+        return null;
+    }
+}
+"""
 
-async def _extract_selectors_data(context: Union[Page, Frame], selectors: Optional[Dict[str, str]]) -> Dict[str, Any]:
-    """Extracts data based on specific CSS selectors within the given context."""
+async def _extract_element_html(context: Union[Page, Frame], selector: str) -> Optional[str]:
+    """Returns the inner HTML of the first element matching selector, or None if there is none."""
+    data = await context.evaluate(_EXTRACT_ELEMENT_JS, selector)
+    if data is not None and data["html"] is not None:
+        return data["html"]
+    # Playwright-only selector syntax, or a match inside an open shadow root: resolve it
+    # through the Playwright engine, which handles both
+    element = await context.query_selector(selector)
+    return await element.inner_html() if element else None
+
+async def _query_selector_texts(context: Union[Page, Frame], selector: str) -> list:
+    """Fallback for selectors that only the Playwright selector engine understands."""
+    # One round-trip for all matches rather than one inner_text() call per element
+    return await context.eval_on_selector_all(selector, _ELEMENT_TEXTS_JS)
+
+async def _extract_selectors_data(
+    context: Union[Page, Frame],
+    selectors: Optional[Dict[str, str]],
+    batch_texts: Optional[Dict[str, Optional[list]]] = None,
+) -> Dict[str, Any]:
+    """
+    Extracts data based on specific CSS selectors within the given context.
+    `batch_texts` are texts already collected by _extract_content; without them the
+    selectors are evaluated here.
+    """
     if not selectors:
         return {}
 
     extracted_data: Dict[str, Any] = {}
     context_type = "Page" if isinstance(context, Page) else f"Frame({context.name or context.url[:50]})"
-    logger.info(f"[{context_type}] Extracting specific selectors: {list(selectors.keys())}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("[%s] Extracting specific selectors: %s", context_type, list(selectors.keys()))
+    if batch_texts is None:
+        try:
+            batch_texts = await context.evaluate(_EXTRACT_SELECTORS_JS, list(selectors.items()))
+        except Exception as e:
+            logger.warning("[%s] Batch selector extraction failed, falling back to per-selector queries: %s", context_type, e)
+            batch_texts = {}
+
+    # Selectors the batch couldn't run or found nothing for (possibly inside a shadow root)
+    # go through the Playwright engine, concurrently
+    fallback_names = [name for name in selectors if not batch_texts.get(name)]
+    if fallback_names:
+        fallback_texts = await asyncio.gather(
+            *(_query_selector_texts(context, selectors[name]) for name in fallback_names),
+            return_exceptions=True,
+        )
+        batch_texts = {**batch_texts, **dict(zip(fallback_names, fallback_texts))}
+
     for name, selector in selectors.items():
         try:
-            elements = await context.query_selector_all(selector)
-            if elements:
-                element_texts = []
-                for element in elements:
-                    text_content = await element.inner_text()
-                    element_texts.append(text_content.strip() if text_content else "")
-                
-                if len(element_texts) == 1:
-                    extracted_data[name] = element_texts[0]
-                elif len(element_texts) > 1:
-                    extracted_data[name] = element_texts
-                else:
-                    extracted_data[name] = None
+            element_texts = batch_texts[name]
+            if isinstance(element_texts, BaseException):
+                raise element_texts
+
+            if len(element_texts) == 1:
+                extracted_data[name] = element_texts[0]
+            elif len(element_texts) > 1:
+                extracted_data[name] = element_texts
             else:
                 extracted_data[name] = None
-                logger.warning(f"[{context_type}] No elements found for selector '{selector}' (name: '{name}')")
+                logger.warning("[%s] No elements found for selector '%s' (name: '%s')", context_type, selector, name)
         except Exception as e:
-            logger.warning(f"[{context_type}] Error extracting '{name}' with selector '{selector}': {str(e)}")
+            logger.warning("[%s] Error extracting '%s' with selector '%s': %s", context_type, name, selector, e)
             extracted_data[name] = None
-    logger.info(f"[{context_type}] Finished extracting specific selectors. Found data for keys: {list(extracted_data.keys())}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("[%s] Finished extracting specific selectors. Found data for keys: %s", context_type, list(extracted_data.keys()))
     return extracted_data
 
+async def _try_static_fetch(
+    url: str,
+    headers: Optional[Dict[str, str]],
+    timeout: int,
+    wait_for_selector_on_page: Optional[str],
+    extract_element_selector: Optional[str],
+    extract_text: bool = True,
+    include_html: bool = True,
+) -> Optional[Dict[str, Any]]:
+    """
+    Fetches the page with a plain HTTP GET and extracts it without a browser.
+    Returns None whenever the static HTML can't be trusted to match what the browser
+    would render (error status, non-HTML, missing selectors, too little text), in
+    which case the caller falls through to Playwright.
+    """
+    try:
+        # httpx timeouts apply per read, so bound the whole fetch to keep the browser's share intact
+        fetched = await asyncio.wait_for(_fetch_static_body(url, headers, timeout), timeout / 1000)
+    except (httpx.HTTPError, asyncio.TimeoutError) as e:
+        logger.info("Static fetch failed for %s, falling back to browser: %r", url, e)
+        return None
+    if fetched is None:
+        return None
+
+    # Decoding and parsing are CPU-bound: keep them off the event loop so concurrent crawls keep moving
+    content, charset = fetched
+    return await asyncio.to_thread(
+        _evaluate_static_html, url, content, charset,
+        wait_for_selector_on_page, extract_element_selector, extract_text, include_html
+    )
+
+async def _fetch_static_body(url: str, headers: Optional[Dict[str, str]], timeout: int) -> Optional[Tuple[bytes, Optional[str]]]:
+    """
+    Streams the response body and its charset. Returns None without reading the body
+    when the headers already rule it out (error status, non-HTML), or stops reading
+    once the body exceeds MAX_STATIC_BODY_BYTES.
+    """
+    async with get_http_client().stream("GET", url, headers=_merge_headers(headers), timeout=timeout / 1000) as response:
+        content_type = response.headers.get("content-type", "")
+        if response.status_code != 200 or "html" not in content_type:
+            logger.info("Static fetch for %s returned %s (%s), falling back to browser.", url, response.status_code, content_type)
+            return None
+        content_length = response.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > MAX_STATIC_BODY_BYTES:
+            logger.info("Static response for %s is %s bytes, falling back to browser.", url, content_length)
+            return None
+
+        chunks = []
+        size = 0
+        async for chunk in response.aiter_bytes():
+            size += len(chunk)
+            if size > MAX_STATIC_BODY_BYTES:
+                logger.info("Static response for %s exceeds %s bytes, falling back to browser.", url, MAX_STATIC_BODY_BYTES)
+                return None
+            chunks.append(chunk)
+        return b"".join(chunks), response.charset_encoding
+
+def _decode_static_html(content: bytes, header_charset: Optional[str]) -> Optional[str]:
+    """
+    Decodes the response body the way the browser would: BOM, then the Content-Type
+    charset, then a <meta> charset, then UTF-8. Returns None if the body doesn't decode
+    cleanly with that encoding, so the caller can leave the page to the browser.
+    """
+    if content.startswith(b"\xef\xbb\xbf"):
+        charset = "utf-8-sig"
+    elif content.startswith((b"\xff\xfe", b"\xfe\xff")):
+        charset = "utf-16"
+    elif header_charset:
+        charset = header_charset
+    else:
+        match = _META_CHARSET_RE.search(content, 0, _META_PRESCAN_BYTES)
+        charset = match.group(1).decode("ascii") if match else "utf-8"
+    charset = charset.lower()
+    try:
+        return content.decode(_BROWSER_CODECS.get(charset, charset))
+    except (LookupError, UnicodeDecodeError):
+        return None
+
+def _evaluate_static_html(
+    url: str,
+    content: bytes,
+    header_charset: Optional[str],
+    wait_for_selector_on_page: Optional[str],
+    extract_element_selector: Optional[str],
+    extract_text: bool,
+    include_html: bool,
+) -> Optional[Dict[str, Any]]:
+    """Builds the crawl result from static HTML, or returns None if the browser is needed."""
+    page_content = _decode_static_html(content, header_charset)
+    if page_content is None:
+        logger.info("Could not determine the encoding of static HTML for %s, falling back to browser.", url)
+        return None
+    try:
+        tree = LexborHTMLParser(page_content)
+        if wait_for_selector_on_page and tree.css_first(wait_for_selector_on_page) is None:
+            logger.info("Selector '%s' not in static HTML for %s, falling back to browser.", wait_for_selector_on_page, url)
+            return None
+        if extract_element_selector:
+            element = tree.css_first(extract_element_selector)
+            if element is None:
+                logger.info("Element '%s' not in static HTML for %s, falling back to browser.", extract_element_selector, url)
+                return None
+            extracted_html = element.inner_html or ""
+            # Same JS-shell check as for full pages: an empty mount point such as
+            # <div id="root"></div> only gets its content once the browser runs the app
+            element_text_length = len(_html_to_text(extracted_html))
+            if element_text_length < MIN_STATIC_TEXT_LENGTH:
+                logger.info("Element '%s' has little text in static HTML for %s (length: %s), falling back to browser.", extract_element_selector, url, element_text_length)
+                return None
+            logger.info("Static fetch extracted element HTML for %s (length: %s)", url, len(extracted_html))
+            return {"extracted_content": extracted_html}
+
+        title_node = tree.css_first("title")
+        title = title_node.text(strip=True) if title_node else None
+        # Needed even when extract_text is False: the text length is what tells a
+        # server-rendered page apart from a JS app shell
+        text = _tree_to_text(tree)
+    except Exception as e:
+        # Playwright-only selector syntax, unparsable markup, ...
+        logger.info("Could not evaluate static HTML for %s, falling back to browser: %s", url, e)
+        return None
+
+    if len(text) < MIN_STATIC_TEXT_LENGTH:
+        logger.info("Static HTML for %s has little text (length: %s), falling back to browser.", url, len(text))
+        return None
+
+    logger.info("Static fetch succeeded for %s (text length: %s)", url, len(text))
+    return {
+        "title": title,
+        "text": text if extract_text else None,
+        "html": page_content if include_html else None,
+    }
+
 # --- Main Public Function --- 
 
 async def crawl_webpage(
@@ -177,6 +578,13 @@ async def crawl_webpage(
     extract_element_selector: Optional[str] = None,
     timeout: int = 30000,
     headers: Optional[Dict[str, str]] = None,
+    browser: Optional[Browser] = None,
+    block_resources: Optional[Collection[str]] = None,
+    force_browser: bool = False,
+    extract_text: bool = True,
+    include_html: bool = True,
+    wait_for_network_idle: Optional[bool] = None,
+    timeouts: CrawlTimeouts = DEFAULT_CRAWL_TIMEOUTS,
 ) -> Dict[str, Any]:
     """
     Crawls a webpage using Playwright, potentially focusing on a specific iframe,
@@ -191,11 +599,25 @@ async def crawl_webpage(
         extract_element_selector: Optional CSS selector to extract a specific element's HTML.
         timeout: Total timeout for the operation in milliseconds
         headers: HTTP headers to send with the request
+        browser: Optional browser to use instead of the shared one from get_browser().
+            Each crawl gets its own BrowserContext either way.
+        block_resources: Playwright resource types to abort (e.g. "image", "stylesheet").
+            Defaults to DEFAULT_BLOCKED_RESOURCE_TYPES; pass an empty collection to load everything.
+        force_browser: Skip the plain HTTP fast path and always render with Playwright.
+            The fast path is also skipped for iframe targets and extract_selectors, which
+            rely on innerText of the rendered page.
+        extract_text: Set to False when only the HTML is needed to skip the parse-and-strip
+            text conversion ("text" is then None).
+        include_html: Set to False to leave out the full page HTML ("html" is then None);
+            the text then comes straight from the renderer's innerText.
+        wait_for_network_idle: Whether to wait for network idle after DOMContentLoaded.
+            None (default) waits only when no readiness selector is given.
+        timeouts: How `timeout` is split between the steps (see CrawlTimeouts).
         
     Returns:
         Dictionary with page data including status and potential error.
     """
-    logger.info(f"Crawling URL: {url} with timeout {timeout}ms. Target iframe: {iframe_selector}, Extract Element: {extract_element_selector}")
+    logger.info("Crawling URL: %s with timeout %sms. Target iframe: %s, Extract Element: %s", url, timeout, iframe_selector, extract_element_selector)
     
     result = {
         "url": url,
@@ -208,29 +630,52 @@ async def crawl_webpage(
         "error": None
     }
     
-    browser: Optional[Browser] = None 
+    # Fast path: many pages serve their full content without JS, so try a plain GET first
+    if not force_browser and not iframe_selector and not extract_selectors:
+        static_started = time.monotonic()
+        static_result = await _try_static_fetch(
+            url, headers, int(timeout * timeouts.static_fetch_fraction), wait_for_selector_on_page, extract_element_selector, extract_text, include_html
+        )
+        if static_result is not None:
+            result.update(static_result)
+            return result
+        # The browser only gets what is left of the total timeout
+        timeout = max(timeout - int((time.monotonic() - static_started) * 1000), 1)
+
+    browser_context: Optional[BrowserContext] = None
     try:
         # Allocate portions of the timeout
-        # Example: 60% for navigation, 10% for page wait, 5% for iframe find, 15% for iframe wait
-        nav_timeout = timeout * 0.6
-        page_wait_timeout = timeout * 0.1
-        iframe_find_timeout = 5000 # Keep iframe find relatively short
-        iframe_wait_timeout = timeout * 0.15 
+        nav_timeout = int(timeout * timeouts.nav_fraction)
+        idle_timeout = int(nav_timeout * timeouts.network_idle_fraction)
+        page_wait_timeout = int(timeout * timeouts.page_wait_fraction)
+        iframe_wait_timeout = int(timeout * timeouts.iframe_wait_fraction)
         # Remaining time for extraction? Ensure total doesn't exceed original timeout.
 
-        browser, page = await _setup_browser_and_page()
-        await _set_page_headers(page, headers)
+        if browser is None:
+            browser = await get_browser()
+        browser_context, page = await _setup_context_and_page(
+            browser, DEFAULT_BLOCKED_RESOURCE_TYPES if block_resources is None else block_resources, headers
+        )
         
         # Step 1: Navigate and basic wait
-        await _navigate_and_wait(page, url, int(nav_timeout)) # Pass allocated timeout
+        # A readiness selector means "I know when it's ready", so skip the (often slow) network-idle wait
+        if wait_for_network_idle is None:
+            wait_for_network_idle = not (wait_for_selector_on_page or (iframe_selector and wait_for_selector_in_iframe))
+        await _navigate_and_wait(page, url, nav_timeout, idle_timeout, wait_for_network_idle=wait_for_network_idle) # Pass allocated timeout
+        if not wait_for_network_idle:
+            # Hand the unused idle budget to the readiness selector wait instead, which is
+            # what actually waits for the content after DOMContentLoaded
+            if wait_for_selector_on_page:
+                page_wait_timeout += idle_timeout
+            else:
+                iframe_wait_timeout += idle_timeout
         
         # Step 2: Wait for selector on the main page
-        await _wait_for_optional_selector(page, wait_for_selector_on_page, int(page_wait_timeout), context_name="Page")
+        await _wait_for_optional_selector(page, wait_for_selector_on_page, page_wait_timeout, context_name="Page")
 
         # Step 3: Find the target iframe (if specified)
         # Use a dedicated timeout for finding the frame element
-        # Note: _find_target_frame uses its own internal timeout (5000ms currently)
-        target_context = await _find_target_frame(page, iframe_selector)
+        target_context = await _find_target_frame(page, iframe_selector, timeouts.iframe_find_ms)
         context_name = "Page" if isinstance(target_context, Page) else f"Frame({iframe_selector})"
 
         # Step 4: Wait for selector within the determined context (iframe or page)
@@ -238,35 +683,32 @@ async def crawl_webpage(
         # If context is page, wait_for_selector_on_page was already handled. 
         # If context is frame, wait using wait_for_selector_in_iframe.
         if isinstance(target_context, Frame):
-             await _wait_for_optional_selector(target_context, wait_for_selector_in_iframe, int(iframe_wait_timeout), context_name=context_name)
+             await _wait_for_optional_selector(target_context, wait_for_selector_in_iframe, iframe_wait_timeout, context_name=context_name)
         # else: The page context wait was done in step 2.
 
         # Step 5: Extract content or specific element
+        selector_texts: Optional[Dict[str, Optional[list]]] = None
         if extract_element_selector:
-            logger.info(f"[{context_name}] Attempting to extract element with selector: {extract_element_selector}")
-            element = await target_context.query_selector(extract_element_selector)
-            if element:
-                # Decide whether to use inner_html or outer_html
-                # inner_html excludes the element itself, outer_html includes it.
-                extracted_html = await element.inner_html() # Or outer_html()
+            logger.info("[%s] Attempting to extract element with selector: %s", context_name, extract_element_selector)
+            # inner HTML excludes the element itself (outerHTML would include it)
+            extracted_html = await _extract_element_html(target_context, extract_element_selector)
+            if extracted_html is not None:
                 result["extracted_content"] = extracted_html
-                logger.info(f"[{context_name}] Successfully extracted element HTML (length: {len(extracted_html)}). Setting full html to None.")
+                logger.info("[%s] Successfully extracted element HTML (length: %s). Setting full html to None.", context_name, len(extracted_html))
                 result["html"] = None # Don't include full HTML if element is extracted
-                # Optionally extract text content of the specific element too? 
-                # result["text"] = await element.text_content()
+                # Optionally extract text content of the specific element too?
             else:
                 error_message = f"Could not find element matching selector: {extract_element_selector}"
-                logger.warning(f"[{context_name}] {error_message}")
+                logger.warning("[%s] %s", context_name, error_message)
                 result["status"] = "error"
                 result["error"] = error_message
                 # Return early if the required element wasn't found?
                 # return result # Optional: stop processing here
         else:
             # Original behavior: Extract full content if no specific element selector is given
-            logger.info(f"[{context_name}] No specific element selector provided, extracting full content.")
-            # Determine if full HTML is needed (might be needed for text extraction anyway)
-            needs_full_html = True # Assume needed for text extraction or if requested explicitly later
-            title, text, html = await _extract_content(target_context, needs_full_html)
+            logger.info("[%s] No specific element selector provided, extracting full content.", context_name)
+            # extract_selectors are evaluated in the same round-trip
+            title, text, html, selector_texts = await _extract_content(target_context, include_html, extract_text, extract_selectors)
             result["title"] = title 
             result["text"] = text
             result["html"] = html # Store the full HTML
@@ -274,22 +716,25 @@ async def crawl_webpage(
         # Step 6: Extract specific selectors (can run even if specific element was extracted)
         # If result is already error, maybe skip this?
         if result["status"] == "success":
-            result["extracted_data"] = await _extract_selectors_data(target_context, extract_selectors)
+            result["extracted_data"] = await _extract_selectors_data(target_context, extract_selectors, selector_texts)
 
     except PlaywrightError as pe:
         error_msg = f"Playwright Error: {str(pe)}"
-        logger.error(f"{error_msg} during crawl of {url}")
+        logger.error("%s during crawl of %s", error_msg, url)
         result["status"] = "error"
         result["error"] = error_msg
     except Exception as e:
         error_msg = f"Unexpected Error: {str(e)}"
-        logger.exception(f"{error_msg} during crawl of {url}")
+        logger.exception("%s during crawl of %s", error_msg, url)
         result["status"] = "error"
         result["error"] = error_msg
     finally:
-        if browser:
-            logger.info("Closing browser.")
-            await browser.close()
+        if browser_context:
+            try:
+                await browser_context.close()
+            except Exception as close_e:
+                # e.g. the browser crashed mid-crawl; get_browser() relaunches it next time
+                logger.warning("Failed to close browser context for %s: %s", url, close_e)
             
     return result
 
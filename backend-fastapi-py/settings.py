@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
+from services.web_crawler import DEFAULT_CRAWL_TIMEOUTS
 
 class Settings(BaseSettings):
     # .env 파일 또는 환경 변수에서 로드될 설정 정의
@@ -8,6 +9,32 @@ class Settings(BaseSettings):
     # 현재 사용되지 않지만 향후 추가될 수 있는 설정 예시
     # DEFAULT_CRAWLER_TIMEOUT_MS: int = 30000 
 
+    # 워커당 공유 브라우저에서 동시에 열 수 있는 최대 BrowserContext 수
+    CRAWLER_MAX_CONTEXTS: int = 8
+
+    # 같은 호스트의 리버스 프록시 뒤에서 실행할 때 TCP 대신 바인딩할 UNIX 도메인 소켓 경로
+    # 예: UVICORN_UDS=/tmp/llms-gui.sock (nginx: proxy_pass http://unix:/tmp/llms-gui.sock;)
+    UVICORN_UDS: Optional[str] = None
+
+    # 워커당 HTML 파싱 전용 프로세스 수 (0이면 프로세스 풀 대신 스레드 풀에서 파싱)
+    HTML_PARSE_PROCESSES: int = 2
+
+    # 동일한 크롤링 요청의 결과를 재사용할 시간(초, 0이면 캐시와 중복 요청 병합 비활성화)과
+    # 워커당 보관할 최대 결과 수 (결과에 전체 HTML이 포함될 수 있으므로 너무 크게 잡지 않음)
+    # 캐시는 기본으로 켜져 있으므로 최신 결과가 필요한 요청은 noCache: true를 보내 캐시를 건너뜀
+    CRAWL_CACHE_TTL: int = 300
+    CRAWL_CACHE_SIZE: int = 64
+
+    # 크롤링 전체 timeout을 단계별로 나누는 비율 (정적 HTTP 요청, 페이지 이동, 페이지/iframe 셀렉터 대기)과
+    # iframe 요소를 찾는 고정 timeout(ms), 페이지 이동 timeout 중 네트워크 유휴 대기에 쓰는 비율
+    # (기본값은 크롤러의 CrawlTimeouts 기본값을 그대로 사용)
+    CRAWL_STATIC_FETCH_FRAC: float = DEFAULT_CRAWL_TIMEOUTS.static_fetch_fraction
+    CRAWL_NAV_FRAC: float = DEFAULT_CRAWL_TIMEOUTS.nav_fraction
+    CRAWL_PAGE_WAIT_FRAC: float = DEFAULT_CRAWL_TIMEOUTS.page_wait_fraction
+    CRAWL_IFRAME_WAIT_FRAC: float = DEFAULT_CRAWL_TIMEOUTS.iframe_wait_fraction
+    CRAWL_IFRAME_FIND_MS: int = DEFAULT_CRAWL_TIMEOUTS.iframe_find_ms
+    CRAWL_NETWORK_IDLE_FRAC: float = DEFAULT_CRAWL_TIMEOUTS.network_idle_fraction
+
     # .env 파일 로드 설정 (선택적)
     model_config = SettingsConfigDict(env_file='.env', extra='ignore')
 